@@ -31,6 +31,8 @@
  */
 
 #include <stdio.h>
+#include <assert.h>
+#include <string.h>
 #include "TTTT.h"
 
 // LOCALS 
@@ -40,10 +42,15 @@ xs_winpath		the_winpath;
 //xs_move			the_winpath[TTTT_WIN_PATH_SIZE];
 xs_pathcount	the_path_counts_mac;
 xs_pathcount	the_path_counts_human;
+xs_bitboard		the_bits_mac;
+xs_bitboard		the_bits_human;
+long			the_board_score;											// boardeval of the_board, kept as moves are made
+
+static const xs_bitboard	kXS_FULL_BOARD = ~(xs_bitboard)0;
 
 
 // the lower the score the better it is for the machine. 
-xs_weighttab		the_weights =
+const xs_weighttab	the_weights =
 {
 {0,-2,-4,-8,-16},		 
 {2,0,0,0,0},
@@ -53,7 +60,7 @@ xs_weighttab		the_weights =
 };
 
 // the winning paths table is all 1 based at this time
-xs_winstable		the_wins_path_ids_table = 
+const xs_winstable	the_wins_path_ids_table = 
 {
 {0,4,8,40,56,60,64},
 {0,5,-1,41,-1,-1,68},
@@ -121,41 +128,62 @@ xs_winstable		the_wins_path_ids_table =
 {33,37,38,55,58,61,64}
 };
 
+// the path masks are the wins table turned inside out, one bit per board position on each winning path
+const xs_bitboard	the_path_masks[TTTT_WINNING_POSITIONS_COUNT] =
+{
+0x000000000000000FULL, 0x00000000000000F0ULL, 0x0000000000000F00ULL, 0x000000000000F000ULL,
+0x0000000000001111ULL, 0x0000000000002222ULL, 0x0000000000004444ULL, 0x0000000000008888ULL,
+0x0000000000008421ULL, 0x0000000000001248ULL, 0x00000000000F0000ULL, 0x0000000000F00000ULL,
+0x000000000F000000ULL, 0x00000000F0000000ULL, 0x0000000011110000ULL, 0x0000000022220000ULL,
+0x0000000044440000ULL, 0x0000000088880000ULL, 0x0000000084210000ULL, 0x0000000012480000ULL,
+0x0000000F00000000ULL, 0x000000F000000000ULL, 0x00000F0000000000ULL, 0x0000F00000000000ULL,
+0x0000111100000000ULL, 0x0000222200000000ULL, 0x0000444400000000ULL, 0x0000888800000000ULL,
+0x0000842100000000ULL, 0x0000124800000000ULL, 0x000F000000000000ULL, 0x00F0000000000000ULL,
+0x0F00000000000000ULL, 0xF000000000000000ULL, 0x1111000000000000ULL, 0x2222000000000000ULL,
+0x4444000000000000ULL, 0x8888000000000000ULL, 0x8421000000000000ULL, 0x1248000000000000ULL,
+0x0001000100010001ULL, 0x0002000200020002ULL, 0x0004000400040004ULL, 0x0008000800080008ULL,
+0x0010001000100010ULL, 0x0020002000200020ULL, 0x0040004000400040ULL, 0x0080008000800080ULL,
+0x0100010001000100ULL, 0x0200020002000200ULL, 0x0400040004000400ULL, 0x0800080008000800ULL,
+0x1000100010001000ULL, 0x2000200020002000ULL, 0x4000400040004000ULL, 0x8000800080008000ULL,
+0x0008000400020001ULL, 0x0001000200040008ULL, 0x8000400020001000ULL, 0x1000200040008000ULL,
+0x1000010000100001ULL, 0x8000080000800008ULL, 0x0001001001001000ULL, 0x0008008008008000ULL,
+0x8000040000200001ULL, 0x1000020000400008ULL, 0x0008004002001000ULL, 0x0001002004008000ULL,
+0x2000020000200002ULL, 0x4000040000400004ULL, 0x0080004000200010ULL, 0x0800040002000100ULL,
+0x0010002000400080ULL, 0x0100020004000800ULL, 0x0002002002002000ULL, 0x0004004004004000ULL,
+};
+
+// string rep character for each xs_player value
+const char			the_player_chars[] = { '_', 'O', 'X' };
+
 
 
 #pragma mark LOCAL FUNCTIONS
+// the path's squares come straight off its mask, lowest position first
 void setwinpath(int pathwinner)
 {
-	int	i;
-	int k;
-	
-	int tally = 0;
+	xs_bitboard	path_bits = the_path_masks[pathwinner];
+	int			tally = 0;
 	
-	for (i=0; i<TTTT_BOARD_POSITIONS; i++) {
-		for (k=0; k<7; k++) {
-			if (pathwinner == the_wins_path_ids_table[i][k] ) {
-				the_winpath[tally++] = i;							// global array only good when there is a winner.
-			}			
-		}
+	while (path_bits) {
+		the_winpath[tally++] = __builtin_ctzll(path_bits);		// global array only good when there is a winner.
+		path_bits &= path_bits - 1;
 	}
 }
 
-// check by tallying the counts arrays 
+// check each winning path mask against the players bitboards
 xs_player checkforwinners(void)
 {
 	xs_player aWinner = kXS_NOBODY_PLAYER;
 	int j;
 
-	boardeval (the_board);		// this will populate the win path arrays
-	
 	for (j=0; j<TTTT_WINNING_POSITIONS_COUNT; j++)
 	{			
-		if (the_path_counts_mac[j] == TTTT_FOUR_IN_A_ROW)
+		if ((the_bits_mac & the_path_masks[j]) == the_path_masks[j])
 		{
 			aWinner = kXS_MACINTOSH_PLAYER;
 			setwinpath(j);
 		}
-		if (the_path_counts_human[j] == TTTT_FOUR_IN_A_ROW)
+		if ((the_bits_human & the_path_masks[j]) == the_path_masks[j])
 		{
 			aWinner = kXS_HUMAN_PLAYER;
 			setwinpath(j);
@@ -169,22 +197,13 @@ xs_player checkforwinners(void)
 // Blank out Count arrays which are 1's based
 void clearpathcounts()
 {
-	int i;
-	
-	for (i=0; i<TTTT_WINNING_POSITIONS_COUNT; i++ )	{
-		
-		the_path_counts_human[i] = 0;	
-		the_path_counts_mac[i] = 0;	
-	}
+	memset(the_path_counts_human, 0, sizeof(the_path_counts_human));
+	memset(the_path_counts_mac, 0, sizeof(the_path_counts_mac));
 }
 
 void clearwinpath()
 {
-	int i;
-	
-	for (i=0; i<TTTT_WIN_PATH_SIZE; i++ )	{
-		the_winpath[i] = 0;	
-	}
+	memset(the_winpath, 0, sizeof(the_winpath));
 }
 
 
@@ -201,17 +220,18 @@ void initialize()
 void initall()
 {
 	the_winner_is = kXS_NOBODY_PLAYER;
+	the_bits_mac = 0;
+	the_bits_human = 0;
+	the_board_score = TTTT_WINNING_POSITIONS_COUNT * the_weights[0][0];
 	initboard();
 	clearpathcounts();
 	clearwinpath();
 }
 
+// the board is one byte per square so a new game is a single fill
 void initboard()
 {
-	xs_move the_move;
-	for (the_move=0; the_move<TTTT_BOARD_POSITIONS; the_move++)	{
-		the_board[the_move] = kXS_NOBODY_PLAYER;
-	}
+	memset(the_board, kXS_NOBODY_PLAYER, sizeof(the_board));
 }
 
 
@@ -221,12 +241,7 @@ xs_gameboard* getboard(char *pszBoard)
 	
 	for(the_move=0; the_move<TTTT_BOARD_POSITIONS; the_move++)
 	{
-		if(the_board[the_move]==kXS_HUMAN_PLAYER)
-			pszBoard[the_move]='X';
-		else if(the_board[the_move]==kXS_MACINTOSH_PLAYER)
-			pszBoard[the_move]='O';
-		else if(the_board[the_move]==kXS_NOBODY_PLAYER)
-			pszBoard[the_move]='_';
+		pszBoard[the_move] = the_player_chars[the_board[the_move]];
 	}
 	pszBoard[TTTT_BOARD_POSITIONS]='\0';
 	
@@ -244,6 +259,11 @@ xs_move* getwinpath(void)
 	return the_winpath;
 }
 
+int getopensquares(void)
+{
+	return TTTT_BOARD_POSITIONS - __builtin_popcountll(the_bits_mac | the_bits_human);
+}
+
 
 // this is currently 0 based 
 xs_move humanmove (xs_move aMove)
@@ -254,6 +274,10 @@ xs_move humanmove (xs_move aMove)
 	{
 		move_made = aMove;
 		the_board[move_made] = kXS_HUMAN_PLAYER;
+		the_bits_human |= (xs_bitboard)1 << move_made;
+		the_board_score += scoredelta(move_made, kXS_HUMAN_PLAYER);
+		count_human(move_made);
+		assert(the_board_score == boardeval(the_board));
 		the_winner_is = checkforwinners();
 	}	
 	return move_made;		
@@ -267,24 +291,31 @@ xs_move machinemove(void)
 	xs_move trymove = kXS_UNDEFINED_MOVE;
 	long minscore;
 	long boardvalue;
+	xs_bitboard open_bits;
 
-	if ( the_winner_is == kXS_NOBODY_PLAYER)
+	// nothing to do once the game is won or every square is taken
+	if ( the_winner_is == kXS_NOBODY_PLAYER && (the_bits_mac | the_bits_human) != kXS_FULL_BOARD)
 	{
+		// only the empty squares are visited, lowest position first
+		open_bits = ~(the_bits_mac | the_bits_human);
 		minscore = TTTT_VERY_BIG_BOARDVALUE;
-		for (trymove=0; trymove<TTTT_BOARD_POSITIONS; trymove++)
+		while (open_bits)
 		{
-			if (the_board[trymove] == kXS_NOBODY_PLAYER)
+			trymove = __builtin_ctzll(open_bits);
+			open_bits &= open_bits - 1;
+			boardvalue = boardscore(trymove, kXS_MACINTOSH_PLAYER);
+			if (boardvalue < minscore)
 			{
-				boardvalue = boardscore(trymove, kXS_MACINTOSH_PLAYER);
-				if (boardvalue < minscore)
-				{
-					minscore = boardvalue;
-					bestmove = trymove;
-				}
+				minscore = boardvalue;
+				bestmove = trymove;
 			}
 		}
 
 		the_board[bestmove] = kXS_MACINTOSH_PLAYER;
+		the_bits_mac |= (xs_bitboard)1 << bestmove;
+		the_board_score += scoredelta(bestmove, kXS_MACINTOSH_PLAYER);
+		count_machine(bestmove);
+		assert(the_board_score == boardeval(the_board));
 		the_winner_is = checkforwinners();
 	}
 	return bestmove;
@@ -293,60 +324,54 @@ xs_move machinemove(void)
 #pragma mark -
 #pragma mark BOARD SCORING
 
-// Move is 1 based 
-void count_human (xs_move aMove)
+// Move is 0 based, bumps the count of every winning path through it
+void countpaths (xs_pathcount pathCounts, xs_move aMove)
 {
 	int j;
 	int win_path;	
 	
+	assert(aMove >= 0 && aMove < TTTT_BOARD_POSITIONS);
 	for (j=0; j<TTTT_WINPATHSMAX; j++)
 	{
 		win_path = the_wins_path_ids_table[aMove][j];
 		if (win_path >= 0)
 		{
-			the_path_counts_human[win_path] = the_path_counts_human[win_path] + 1;			
+			pathCounts[win_path] = pathCounts[win_path] + 1;			
+			assert(pathCounts[win_path] <= TTTT_FOUR_IN_A_ROW);
 		}
 	}
 }
 
-// Move is 0 based 
+void count_human (xs_move aMove)
+{
+	countpaths(the_path_counts_human, aMove);
+}
+
 void count_machine (xs_move aMove)
 {
-	int	j;
-	int win_path;
-	
-	for (j=0; j<TTTT_WINPATHSMAX; j++)
-	{
-		win_path = the_wins_path_ids_table[aMove][j];
-		if (win_path >= 0)
-		{
-			the_path_counts_mac[win_path] = the_path_counts_mac[win_path] + 1;
-		}
-	}
+	countpaths(the_path_counts_mac, aMove);
 }
 
 
+// Scores any board, it is turned into bitboards locally so the game's path counts are left alone
 long boardeval (xs_gameboard aBoard) {
 	xs_move trymove = kXS_UNDEFINED_MOVE;
+	xs_bitboard bits_human = 0;
+	xs_bitboard bits_mac = 0;
 	int i;
 	long total_score = 0;
 	
-		
-	clearpathcounts();
-	
 	for (trymove=0; trymove<TTTT_BOARD_POSITIONS; trymove++) {
-		if (aBoard[trymove] == kXS_MACINTOSH_PLAYER) {
-			count_machine(trymove);
-		}
-		else if (aBoard[trymove] == kXS_HUMAN_PLAYER) {
-			count_human(trymove);
-		}
+		if (aBoard[trymove] == kXS_MACINTOSH_PLAYER)
+			bits_mac |= (xs_bitboard)1 << trymove;
+		else if (aBoard[trymove] == kXS_HUMAN_PLAYER)
+			bits_human |= (xs_bitboard)1 << trymove;
 	}
 	
 	for (i=0; i<TTTT_WINNING_POSITIONS_COUNT; i++)
 	{
-		int HumPieces = the_path_counts_human[i];
-		int MacPieces = the_path_counts_mac[i];
+		int HumPieces = __builtin_popcountll(bits_human & the_path_masks[i]);
+		int MacPieces = __builtin_popcountll(bits_mac & the_path_masks[i]);
 		total_score = the_weights[HumPieces][MacPieces] + total_score;
 	}
 	
@@ -354,31 +379,38 @@ long boardeval (xs_gameboard aBoard) {
 }
 
 
-// This routine scores only the mac's moves it should be more general 
-// the move is 0 based 
+// Scores the current board with currentPlayer's piece added at aMove, the move is 0 based
 long boardscore(xs_move aMove, xs_player currentPlayer)
 {
-	xs_move			the_move;
-	xs_gameboard	dup_board_game;
-	long			sum = 0;
+	assert(the_board[aMove] == kXS_NOBODY_PLAYER);
+	return the_board_score + scoredelta(aMove, currentPlayer);
+}
+
+
+// How the board score changes when currentPlayer takes aMove, only the paths 
+// through the move change so it is worked out from the game's path counts.
+long scoredelta(xs_move aMove, xs_player currentPlayer)
+{
+	int					j;
+	int					win_path;
+	const signed char	*move_paths = the_wins_path_ids_table[aMove];
+	long				delta = 0;
 	
-	// make a copy of the board
-	for (the_move=0; the_move<TTTT_BOARD_POSITIONS; the_move++)
+	for (j=0; j<TTTT_WINPATHSMAX; j++)
 	{
-		dup_board_game[the_move] = the_board[the_move];
+		win_path = move_paths[j];
+		if (win_path >= 0)
+		{
+			int			HumPieces = the_path_counts_human[win_path];
+			int			MacPieces = the_path_counts_mac[win_path];
+			const int	*weight_row = the_weights[HumPieces];
+			
+			if (currentPlayer == kXS_MACINTOSH_PLAYER)
+				delta = delta - weight_row[MacPieces] + weight_row[MacPieces+1];
+			else
+				delta = delta - weight_row[MacPieces] + the_weights[HumPieces+1][MacPieces];
+		}
 	}
-	// add our move to the board
-	dup_board_game[aMove] = kXS_MACINTOSH_PLAYER;
 	
-	sum = boardeval(dup_board_game);
-	
-	return sum;
+	return delta;
 }
-
-
-
-
-
-
-
-
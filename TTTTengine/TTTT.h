@@ -33,6 +33,7 @@
 #ifndef TTTT_H
 #define TTTT_H
 
+#include <stdint.h>
 #include "TTTTcommon.h"
 
 
@@ -48,13 +49,14 @@ typedef		 int xs_move;
 static const xs_move kXS_UNDEFINED_MOVE = -1;
 
 
-typedef int	xs_winstable[TTTT_BOARD_POSITIONS][TTTT_WINPATHSMAX];				// 0 based 0-63,0-6
+typedef signed char	xs_winstable[TTTT_BOARD_POSITIONS][TTTT_WINPATHSMAX];		// 0 based 0-63,0-6 path ids -1-75 fit a byte
 typedef int xs_weighttab[TTTT_FOUR_IN_A_ROW+1][TTTT_FOUR_IN_A_ROW+1];			// 0 based 0-4 we need 5 ok
 
 
-typedef xs_player	xs_gameboard[TTTT_BOARD_POSITIONS];							// 0 based 1-63
-typedef int			xs_pathcount[TTTT_WINNING_POSITIONS_COUNT];					// 0 based 1-75 
+typedef unsigned char	xs_gameboard[TTTT_BOARD_POSITIONS];						// 0 based 1-63, one byte xs_player per square
+typedef unsigned char	xs_pathcount[TTTT_WINNING_POSITIONS_COUNT];				// 0 based 1-75 counts are 0-4
 typedef xs_move		xs_winpath[TTTT_WIN_PATH_SIZE];
+typedef uint64_t	xs_bitboard;													// one bit per board position 0-63
 
 //typedef xs_move *XSWinPath;
 
@@ -73,8 +75,10 @@ xs_move			machinemove(void);
 xs_gameboard* 	getboard(char *pszBoard);
 xs_player		getwinner(void);
 xs_move*		getwinpath(void);
+int				getopensquares(void);
 
 long			boardscore(xs_move aMove, xs_player currentPlayer);
+long			scoredelta(xs_move aMove, xs_player currentPlayer);
 long			boardeval(xs_gameboard aBoard);
 
 #endif
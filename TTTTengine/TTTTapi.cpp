@@ -33,6 +33,7 @@
 #include <stdlib.h>
 #include <stdio.h>
 #include <string.h>
+#include <ctype.h>
 
 //const char 	*const kDateTimeFormat = "%m/%d/%y %I:%M%p";
 
@@ -50,15 +51,13 @@ void TTTT_Initialize(void)
 
 // Getting properties
 
+// the board is formatted straight into the caller's buffer
 TTTT_Return TTTT_GetBoard( TTTT_GameBoardStringRep pszGameBoard )
 {
-	long						*gameBoard;
-	TTTT_GameBoardStringRep		qszBoard;
-	
-	qszBoard[0]='\0';
-	gameBoard = (long *)getboard(qszBoard);
+	if (pszGameBoard == NULL)
+		return kTTTT_InvalidArgument;
 	
-	strncpy(pszGameBoard, qszBoard, kTTTT_StringRepMaxBufferLength);
+	getboard(pszGameBoard);
 
 	return kTTTT_NoError;
 }
@@ -73,6 +72,13 @@ TTTT_Return TTTT_GetWinner(long *aWinner)
 	return kTTTT_NoError;
 }
 
+TTTT_Return TTTT_GetOpenSquares(long *aCount)
+{
+	*aCount = getopensquares();
+	
+	return kTTTT_NoError;
+}
+
 TTTT_Return	TTTT_GetWinnerPath(TTTT_WinnerMovesArr aWinnerPath)
 {
 	int	i;
@@ -93,16 +99,15 @@ TTTT_Return	TTTT_GetWinnerStringRep(TTTT_GameBoardStringRep pszGameBoard)
 	int	aSpace;
 	int *winpath;
 	
+	// a drawn game still has a board to show, only a win gets the path marked
+	TTTT_GetBoard(pszGameBoard);
 	if (getwinner()) {
 		
 		winpath = getwinpath();
-		TTTT_GetBoard(pszGameBoard);
 		for (i=0; i<TTTT_WIN_PATH_SIZE; i++) {
 			aSpace = winpath[i];
 			pszGameBoard[aSpace]= '*';
 		}
-
-		return kTTTT_NoError;
 	}
 	return kTTTT_NoError;
 }
@@ -124,81 +129,82 @@ TTTT_Return TTTT_MacMove(long *aMove)
 	
 	theMove =  machinemove();
 	*aMove = theMove;
-	 
+	
+	if (theMove == kXS_UNDEFINED_MOVE)
+		return kTTTT_InvalidMove;
 	return kTTTT_NoError;
 }
 
+// Reads a space separated list of 1 based moves in one pass, strtol walks the string 
+// in place so there is no buffer to copy into and no strtok state to set up.
+// Each move is collected as a bit in pMoves, squares already in pTaken are refused 
+// so a square named twice is caught as it is read.
+static TTTT_Return parsemoves(const char *moves, xs_bitboard *pMoves, xs_bitboard *pTaken)
+{
+	const char	*ptr = moves;
+	char		*end;
+	long		aMove;
+	xs_bitboard	square;
+	
+	for (;;) {
+		aMove = strtol(ptr, &end, 10);
+		if (end == ptr)
+			break;
+		if (aMove < 1 || aMove > kTTTT_Positions)
+			return kTTTT_InvalidArgumentOutOfRange;
+		square = (xs_bitboard)1 << (aMove-1);
+		if (*pTaken & square)
+			return kTTTT_InvalidMove;
+		TTTT_DEBUG_LOG("move is: %ld \n", aMove);
+		*pTaken |= square;
+		*pMoves |= square;
+		ptr = end;
+	}
+	while (isspace((unsigned char)*ptr))
+		ptr++;
+	if (*ptr != '\0')
+		return kTTTT_InvalidArgument;
+	
+	return kTTTT_NoError;
+}
+
+// Marks every square in someMoves on the string rep
+static void markmoves(xs_bitboard someMoves, char aMark, TTTT_GameBoardStringRep pszGameBoard)
+{
+	while (someMoves) {
+		pszGameBoard[__builtin_ctzll(someMoves)] = aMark;
+		someMoves &= someMoves - 1;
+	}
+}
+
 // this is a convenience function and does not involve an actual game play it is just a representation conversion
 TTTT_Return	TTTT_StringRep(const char *humanMoves, const char *machineMoves, TTTT_GameBoardStringRep pszGameBoard)
 {
-	int			j;	
-	char		*ptr, *buf;
-	int			tokens_count;
-	
-	long		h_arr[32];
-	long		m_arr[32];
-	
-	size_t		len = 0;
+	xs_bitboard	human_moves = 0;
+	xs_bitboard	machine_moves = 0;
+	xs_bitboard	taken = 0;
+	TTTT_Return	result;
 	
 	if (pszGameBoard == NULL)
 		return kTTTT_InvalidArgument;
+	if (humanMoves == NULL)
+		humanMoves = "";
+	if (machineMoves == NULL)
+		machineMoves = "";
 	
-	// Parse the moves and if there are errors report back
-	len = strlen( humanMoves );
-	if (len<1024) {
-		buf = (char *)malloc(4096);
-		strncpy(buf, humanMoves, len);
-		buf[len]='\0';
-		printf("\nhuman moves len: %ld \nmoves: %s\n", len, humanMoves);
-		
-		
-		tokens_count=0;
-		if( (ptr = strtok(buf, " ")) != NULL ) {
-			h_arr[tokens_count] = strtol(ptr, NULL, 10);
-			tokens_count++;
-			while ( (ptr = strtok(NULL, " ")) != NULL ) {
-				h_arr[tokens_count] = strtol(ptr, NULL, 10);
-				tokens_count++;
-			} 	
-		}
-		
-		for (j=0; j<tokens_count; j++) {
-			printf("h_arr is: %ld \n", h_arr[j]);
-			pszGameBoard[h_arr[j]-1] = 'X';
-		}
-		if (buf) {
-			free(buf);
-			buf=NULL;
-		}
-	}
+	// Parse the moves and if there are errors report back before touching the board
+	TTTT_DEBUG_LOG("\nhuman moves len: %ld \nmoves: %s\n", strlen(humanMoves), humanMoves);
+	result = parsemoves(humanMoves, &human_moves, &taken);
+	if (result != kTTTT_NoError)
+		return result;
 	
-	len = strlen( machineMoves );
-	if (len<1024) {
-		buf = (char *)malloc(4096);
-		strncpy(buf, machineMoves, len);
-		buf[len]='\0';
-		printf("\nmachine moves len: %ld \nmoves: %s\n", len, machineMoves);
-		
-		tokens_count=0;
-		if( (ptr = strtok(buf, " ")) != NULL ) {
-			m_arr[tokens_count] = strtol(ptr, NULL, 10);
-			tokens_count++;
-			while ( (ptr = strtok(NULL, " ")) != NULL ) {
-				m_arr[tokens_count] = strtol(ptr, NULL, 10);
-				tokens_count++;
-			} 	
-		}
-		
-		for (j=0; j<tokens_count; j++) {
-			printf("m_arr is: %ld \n", m_arr[j]);
-			pszGameBoard[m_arr[j]-1] = 'O';
-		}
-		
-		if (buf) {
-			free(buf);
-			buf = NULL;
-		}
-	}
+	TTTT_DEBUG_LOG("\nmachine moves len: %ld \nmoves: %s\n", strlen(machineMoves), machineMoves);
+	result = parsemoves(machineMoves, &machine_moves, &taken);
+	if (result != kTTTT_NoError)
+		return result;
+	
+	markmoves(human_moves, 'X', pszGameBoard);
+	markmoves(machine_moves, 'O', pszGameBoard);
 	
 	return kTTTT_NoError;
 }
@@ -209,17 +215,18 @@ TTTT_Return	TTTT_EvaluateBoardValue(const TTTT_GameBoardStringRep pszGameBoard,
 	int				i;
 	long			score;
 	
-	for (i=0; i<TTTT_BOARD_POSITIONS; i++) {
+	if (pszGameBoard == NULL || pValue == NULL)
+		return kTTTT_InvalidArgument;
+	
+	// a short string leaves the rest of the board empty
+	memset(aBoard, kXS_NOBODY_PLAYER, sizeof(aBoard));
+	for (i=0; i<TTTT_BOARD_POSITIONS && pszGameBoard[i] != '\0'; i++) {
 		if (pszGameBoard[i] == 'X') {
 			aBoard[i] = kXS_HUMAN_PLAYER;
 		}
 		else if (pszGameBoard[i] == 'O') {
 			aBoard[i] = kXS_MACINTOSH_PLAYER;
 		}
-		else {
-			aBoard[i] = kXS_NOBODY_PLAYER;
-		}
-
 	}
 	
 	score = boardeval(aBoard);
@@ -73,7 +73,9 @@ extern "C"
 	export_dll TTTT_Return	TTTT_GetWinner(long *aWinner);
 	export_dll TTTT_Return	TTTT_GetWinnerPath(TTTT_WinnerMovesArr aWinnerPath);
 	export_dll TTTT_Return	TTTT_GetWinnerStringRep(TTTT_GameBoardStringRep pszGameBoard);
+	export_dll TTTT_Return	TTTT_GetOpenSquares(long *aCount);
 	export_dll TTTT_Return 	TTTT_HumanMove(long aMove);
+	// kTTTT_InvalidMove once the game is won or the board is full, there is no move to make
 	export_dll TTTT_Return 	TTTT_MacMove(long *aMove);
 	export_dll TTTT_Return	TTTT_StringRep(const char *humanMoves, const char *machineMoves, TTTT_GameBoardStringRep pszGameBoard);
 	export_dll TTTT_Return	TTTT_EvaluateBoardValue(const TTTT_GameBoardStringRep pszGameBoard, long *pValue);
@@ -41,6 +41,14 @@
 #define TTTT_VERY_BIG_BOARDVALUE		999999;
 
 
+// diagnostic output, only built in when compiled with -DTTTT_DEBUG
+#ifdef TTTT_DEBUG
+#define TTTT_DEBUG_LOG(...)				printf(__VA_ARGS__)
+#else
+#define TTTT_DEBUG_LOG(...)
+#endif
+
+
 
 #endif  // TTTTCOMMON_H
 
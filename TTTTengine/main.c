@@ -34,51 +34,53 @@
 #include <ctype.h>
 #include <stdbool.h>
 #include <stdlib.h>
+#include <string.h>
 #include "TTTTapi.h"
 
 
 void print_stringrep(char *theBoard)
 {
-	int	i=0;
+	char	text[kTTTT_StringRepMaxBufferLength];
+	char	*ptr = text;
+	int		i=0;
 	
-	for(i=0; i<64; i++)
+	for(i=0; i<kTTTT_Positions; i++)
 	{
-		printf("%c ",theBoard[i]);		
+		*ptr++ = theBoard[i];
+		*ptr++ = ' ';
 	}
+	*ptr++ = '\n';
+	*ptr = '\0';
 	
-	printf("\n");
+	fputs(text, stdout);
 }
 
+// the board is laid out into one buffer and written with a single call
 void print_board_string(char *theBoard)
 {
-	int	i;
+	char	text[kTTTT_StringRepMaxBufferLength];
+	char	*ptr = text;
+	char	*cell = theBoard;
+	int		i, row, col;
 	
 	
-	for(i=0; i<4; i++)
+	for(i=0; i<TTTT_FOUR_IN_A_ROW; i++)
 	{
-		printf("%c ",theBoard[i*16 + 0]);
-		printf("%c ",theBoard[i*16 + 1]);
-		printf("%c ",theBoard[i*16 + 2]);
-		printf("%c \n",theBoard[i*16 + 3]);
-		
-		printf("%c ",theBoard[i*16 + 4]);
-		printf("%c ",theBoard[i*16 + 5]);
-		printf("%c ",theBoard[i*16 + 6]);
-		printf("%c \n",theBoard[i*16 + 7]);
-		
-		printf("%c ",theBoard[i*16 + 8]);
-		printf("%c ",theBoard[i*16 + 9]);
-		printf("%c ",theBoard[i*16 + 10]);
-		printf("%c \n",theBoard[i*16 + 11]);
-		
-		printf("%c ",theBoard[i*16 + 12]);
-		printf("%c ",theBoard[i*16 + 13]);
-		printf("%c ",theBoard[i*16 + 14]);
-		printf("%c \n\n",theBoard[i*16 + 15]);
-		
+		for(row=0; row<TTTT_FOUR_IN_A_ROW; row++)
+		{
+			for(col=0; col<TTTT_FOUR_IN_A_ROW; col++)
+			{
+				*ptr++ = *cell++;
+				*ptr++ = ' ';
+			}
+			*ptr++ = '\n';
+		}
+		*ptr++ = '\n';
 	}
+	*ptr++ = '\n';
+	*ptr = '\0';
 	
-	printf("\n");
+	fputs(text, stdout);
 }
 
 void print_board(bool game_over)
@@ -97,30 +99,105 @@ long evaluate_stringrep(const TTTT_GameBoardStringRep pszGameBoard)
 	long		value = 0;
 	
 	
-	TTTT_Initialize();
+	// evaluating a board does not touch the game, so there is no reset per board
 	printf("Board StringRep is: %s\n\n", pszGameBoard);
 	if (TTTT_EvaluateBoardValue(pszGameBoard, &value) == kTTTT_NoError)
 		return value;
 	return 0;
 }
 
-void generate_stringrep(const char *human_moves, const char *machine_moves)
+void print_board_value(const char *stringrep)
+{
+	long myBoardValue = evaluate_stringrep(stringrep);
+	printf("Board Value is: %ld\n\n", myBoardValue);
+}
+
+// one board per line, each result is flushed so a caller can keep the process 
+// open and feed it boards through a pipe
+void evaluate_stream(FILE *input)
+{
+	TTTT_GameBoardStringRep		pszGameBoard;
+	int							c;
+	
+	while (fgets(pszGameBoard, sizeof(pszGameBoard), input) != NULL)
+	{
+		if (strchr(pszGameBoard, '\n') == NULL && !feof(input)) {
+			// too long to be a board, drop the rest of the line rather than scoring it as another one
+			while ((c = getc(input)) != '\n' && c != EOF)
+				;
+			fprintf(stderr, "Board string too long, skipped.\n");
+			continue;
+		}
+		pszGameBoard[strcspn(pszGameBoard, "\r\n")] = '\0';
+		if (pszGameBoard[0] == '\0')
+			continue;
+		print_board_value(pszGameBoard);
+		fflush(stdout);
+	}
+}
+
+TTTT_Return generate_stringrep(const char *human_moves, const char *machine_moves)
 {
 	TTTT_GameBoardStringRep pszGameBoard;
+	TTTT_Return				result;
 
 	TTTT_Initialize();
 	TTTT_GetBoard(pszGameBoard);
-	TTTT_StringRep(human_moves, machine_moves,  pszGameBoard);
+	result = TTTT_StringRep(human_moves, machine_moves,  pszGameBoard);
+
+	switch (result)
+	{
+		case kTTTT_NoError:
+			print_stringrep(pszGameBoard);
+			break;
+			
+		case kTTTT_InvalidArgumentOutOfRange:
+			fprintf(stderr, "Moves must be between 1 and %d.\n", kTTTT_Positions);
+			break;
+			
+		case kTTTT_InvalidMove:
+			fprintf(stderr, "Each square can only be taken once.\n");
+			break;
+			
+		default:
+			fprintf(stderr, "Moves must be numbers separated by spaces.\n");
+			break;
+	}
+	return result;
+}
 
-	print_stringrep(pszGameBoard);
+
+bool announce_winner(TTTT_Return aWinner)
+{
+	bool	game_over = false;
+	
+	switch (aWinner)
+	{
+		case kTTTT_MACHINETOSH:
+			printf("\nGame Over:  Mac Wins\n");
+			game_over = true;
+			break;
+			
+		case kTTTT_HUMAN:
+			printf("\nGame Over:  You Win\n");
+			game_over = true;
+			break;
+			
+		case kTTTT_NOBODY:
+			game_over = false;
+			break;
+			
+	}
+	return game_over;
 }
 
 
+
 void generative_mode(TTTT_GameBoardStringRep pszGameBoard, char *human_moves)
 {
 	int			scanError;
+	int			c;
 	// Game vars
-	TTTT_Return	aWinner;
 	long		theWinner;
 	bool		game_over = false;
 	int			aMove = -1;
@@ -137,35 +214,24 @@ void generative_mode(TTTT_GameBoardStringRep pszGameBoard, char *human_moves)
 		{
 			printf("\n\nPlease enter your move, or a '0' to quit!\n");
 			scanError = scanf ("%d",&aMove);
-			
+			if (scanError == EOF) {
+				aMove = 0;
+				break;
+			}
+			if (scanError != 1) {
+				// drop the bad input rather than spinning on it
+				while ((c = getchar()) != '\n' && c != EOF)
+					;
+			}
 		} while (scanError != 1);
 				
-		if (aMove>0 && aMove <=64)
+		if (aMove>0 && aMove <=kTTTT_Positions)
 		{
 			printf("\nyour move is:  %d\n", aMove);
-			if (TTTT_HumanMove(aMove)==kTTTT_NoError)
+			if (TTTT_HumanMove(aMove-1)==kTTTT_NoError)
 			{
-				aWinner = TTTT_GetWinner(&theWinner);
-				if (aWinner == kTTTT_NOBODY)
-				{
-					aWinner = TTTT_GetWinner(&theWinner);
-				}
-				switch (aWinner)
-				{
-					case kTTTT_MACHINETOSH:
-						printf("\nGame Over:  Mac Wins\n");
-						game_over = true;
-						break;
-						
-					case kTTTT_HUMAN:
-						printf("\nGame Over:  You Win\n");
-						game_over = true;
-						break;
-						
-					case kTTTT_NOBODY:
-						break;
-						
-				}
+				TTTT_GetWinner(&theWinner);
+				game_over = announce_winner(theWinner);
 			}
 			
 		}
@@ -179,32 +245,6 @@ void generative_mode(TTTT_GameBoardStringRep pszGameBoard, char *human_moves)
 }
 
 
-bool announce_winner(TTTT_Return aWinner)
-{
-	bool	game_over;
-	
-	switch (aWinner)
-	{
-		case kTTTT_MACHINETOSH:
-			printf("\nGame Over:  Mac Wins\n");
-			game_over = true;
-			break;
-			
-		case kTTTT_HUMAN:
-			printf("\nGame Over:  You Win\n");
-			game_over = true;
-			break;
-			
-		case kTTTT_NOBODY:
-			game_over = false;
-			break;
-			
-	}
-	return game_over;
-}
-
-
-
 void interactive_mode()
 {
 	int							scanError;
@@ -212,6 +252,7 @@ void interactive_mode()
 	TTTT_Return					result;
 	long						possibleWinner;
 	long						aMove;
+	long						openSquares;
 	bool						game_over = false;
 	
 	TTTT_Initialize();
@@ -230,7 +271,7 @@ void interactive_mode()
 				aMove = -1;
 			}
 			
-			if (aMove>0 && aMove <=64)
+			if (aMove>0 && aMove <=kTTTT_Positions)
 			{
 				printf("\nyour move is:  %ld\n", aMove);
 				if ( TTTT_HumanMove(aMove-1) == kTTTT_NoError )
@@ -254,10 +295,18 @@ void interactive_mode()
 		if ( !game_over )
 		{
 			result = TTTT_MacMove(&aMove);
-			printf("\ncomputer move is:  %ld\n", aMove+1);
+			if (result == kTTTT_NoError)
+				printf("\ncomputer move is:  %ld\n", aMove+1);
 			result = TTTT_GetWinner(&possibleWinner);
 			game_over = announce_winner(possibleWinner);
 			
+			// the human moves first so the computer always takes the last square
+			TTTT_GetOpenSquares(&openSquares);
+			if (!game_over && openSquares == 0) {
+				printf("\nGame Over:  Draw\n");
+				game_over = true;
+			}
+			
 			// display board
 			print_board(game_over);
 		}
@@ -307,10 +356,12 @@ int main(int argc, char* argv[])
 			abort ();
 	}
 	
-	printf ("evalflag = %d, genflag = %d, gameflag = %d, mvalue = %s, hvalue = %s\n", evalflag, genflag, gameflag, mvalue, hvalue);
+	TTTT_DEBUG_LOG ("evalflag = %d, genflag = %d, gameflag = %d, mvalue = %s, hvalue = %s\n", evalflag, genflag, gameflag, mvalue, hvalue);
 	
-	for (index = optind; index < argc; index++)
-		printf ("Non-option argument %s\n\n\n", argv[index]);
+	if (!evalflag) {
+		for (index = optind; index < argc; index++)
+			printf ("Non-option argument %s\n\n\n", argv[index]);
+	}
 
 	//	return 0;
 	
@@ -318,11 +369,17 @@ int main(int argc, char* argv[])
 		interactive_mode();
 	}
 	else if (genflag) {
-		generate_stringrep( hvalue, mvalue );
+		if (generate_stringrep( hvalue, mvalue ) != kTTTT_NoError)
+			return 1;
 	}
 	else if (evalflag) {
-		long myBoardValue = evaluate_stringrep(stringrep);
-		printf("Board Value is: %ld\n\n", myBoardValue);
+		// boards after the -e one are evaluated in the same run, "-" reads them from stdin
+		if (strcmp(stringrep, "-") == 0)
+			evaluate_stream(stdin);
+		else
+			print_board_value(stringrep);
+		for (index = optind; index < argc; index++)
+			print_board_value(argv[index]);
 	}
 	return 0;
 }